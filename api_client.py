@@ -1,10 +1,12 @@
+import requests
 
-from config import GOOGLE_API_KEY
+from config import GOOGLE_API_KEY, GOOGLE_GEOCODE_URL
 
 def get_coordinates(place_name):
     """Fetch latitude & longitude using Google Geocoding API."""
-    url = f"https://maps.googleapis.com/maps/api/geocode/json?address={place_name}&key={GOOGLE_API_KEY}"
-    response = requests.get(url)
+    response = requests.get(
+        GOOGLE_GEOCODE_URL, params={"address": place_name, "key": GOOGLE_API_KEY}, timeout=10
+    )
     response.raise_for_status()
     data = response.json()
 
@@ -18,9 +18,17 @@ def _get_config_value(key: str, default: str | None = None) -> str | None:
 
 # Google API Key
 GOOGLE_API_KEY = _get_config_value("GOOGLE_API_KEY")
+GOOGLE_GEOCODE_URL = _get_config_value(
+    "GOOGLE_GEOCODE_URL", "https://maps.googleapis.com/maps/api/geocode/json"
+)
 
 # AWS S3 Config
 AWS_ACCESS_KEY = _get_config_value("AWS_ACCESS_KEY")
 AWS_SECRET_KEY = _get_config_value("AWS_SECRET_KEY")
 S3_BUCKET = _get_config_value("S3_BUCKET")
 REGION = _get_config_value("REGION")
+# Optional: S3-compatible endpoint (e.g. MinIO or the load-test stub); unset means AWS
+S3_ENDPOINT_URL = _get_config_value("S3_ENDPOINT_URL")
+
+# Basic scoring (main.py) computes signs via the fast ephemeris path; set to 0 for full kerykeion charts
+FAST_SIGN_PATH = _get_config_value("FAST_SIGN_PATH", "1") != "0"
@@ -1,18 +1,294 @@
-import pandas as pd
+import csv
+import gzip
+import io
+import re
+import threading
+from datetime import date
 from pathlib import Path
 
-CSV_FILE = Path("data/matches.csv")
+import pandas as pd
+
+# Match log: one directory of gzip CSV segments partitioned by day, e.g.
+# data/matches/2025-08-08-000.csv.gz, rotated once a segment reaches the size cap.
+LOG_DIR = Path("data/matches")
+LEGACY_CSV = Path("data/matches.csv")
+MAX_SEGMENT_BYTES = 256 * 1024
+# Worst-case bytes a gzip stream can still grow by after a flush (deflate framing + trailer)
+GZIP_OVERHEAD = 64
+SEGMENT_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})-(\d{3,})\.csv\.gz$")
+
+# Columns written by main.py, in the order it used before the log was partitioned
+BASIC_COLUMNS = [
+    "person1_name", "person1_sun_sign", "person1_moon_sign", "person1_ascendant",
+    "person2_name", "person2_sun_sign", "person2_moon_sign", "person2_ascendant",
+    "compatibility_score", "match_date",
+]
+# Canonical column order for every segment (basic + enhanced fields)
+COLUMNS = [
+    "person1_name", "person1_sun_sign", "person1_moon_sign", "person1_ascendant",
+    "person1_venus", "person1_mars",
+    "person2_name", "person2_sun_sign", "person2_moon_sign", "person2_ascendant",
+    "person2_venus", "person2_mars",
+    "compatibility_score", "compatibility_points", "total_possible_points", "match_date",
+]
+NUMERIC_COLUMNS = ["compatibility_score", "compatibility_points", "total_possible_points"]
+
+# Held by appends, and by compaction while it rewrites a day, so no row lands in a segment being merged
+_append_lock = threading.Lock()
+# Held by compaction, and briefly by readers while they open a day's segments
+_compact_lock = threading.Lock()
+
+
+def _seq(path):
+    return int(SEGMENT_PATTERN.match(path.name).group(2))
+
+
+def _segments(log_dir):
+    """Return {day: [segment paths sorted by sequence]} for the log directory."""
+    days = {}
+    for path in Path(log_dir).glob("*.csv.gz"):
+        m = SEGMENT_PATTERN.match(path.name)
+        if m:
+            days.setdefault(m.group(1), []).append(path)
+    return {day: sorted(paths, key=_seq) for day, paths in sorted(days.items())}
+
+
+def _segment_path(log_dir, day, seq):
+    return Path(log_dir) / f"{day}-{seq:03d}.csv.gz"
+
+
+def _next_seq(paths):
+    return max((_seq(p) for p in paths), default=-1) + 1
+
+
+def _read_header(path):
+    with gzip.open(path, "rt", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def _fieldnames(keys):
+    """Canonical columns first, then any unknown keys in sorted order."""
+    return COLUMNS + sorted(k for k in keys if k not in COLUMNS)
+
 
 def append_to_csv(match_data):
-    """Append new match data to CSV file."""
-    df_new = pd.DataFrame([match_data])
-
-    if CSV_FILE.exists():
-        df_existing = pd.read_csv(CSV_FILE)
-        df_all = pd.concat([df_existing, df_new], ignore_index=True)
-    else:
-        df_all = df_new
-
-    CSV_FILE.parent.mkdir(exist_ok=True)
-    df_all.to_csv(CSV_FILE, index=False)
-    return CSV_FILE
+    """Append new match data to today's log segment and return the segment path."""
+    fieldnames = _fieldnames(match_data)
+
+    with _append_lock:
+        day = date.today().isoformat()
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        paths = _segments(LOG_DIR).get(day, [])
+        path = paths[-1] if paths else None
+        # Rotate when the active segment is full or was written with different columns
+        if path is None or path.stat().st_size >= MAX_SEGMENT_BYTES or _read_header(path) != fieldnames:
+            path = _segment_path(LOG_DIR, day, _next_seq(paths))
+        new_segment = not path.exists()
+
+        # Each append adds a gzip member; compaction later rewrites them as one stream
+        with gzip.open(path, "at", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            if new_segment:
+                writer.writeheader()
+            writer.writerow(match_data)
+
+    if new_segment:
+        # A fresh segment usually means a new day: fold up earlier days in the background
+        threading.Thread(target=compact, name="match-log-compactor").start()
+    return path
+
+
+def _normalize(df):
+    """Map a frame onto the canonical schema: drop empty index columns, coerce numbers."""
+    df = df.loc[:, ~(df.columns.str.startswith("Unnamed:") & df.isna().all().values)]
+    for column in NUMERIC_COLUMNS:
+        if column in df:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df.reindex(columns=_fieldnames(df.columns))
+
+
+def _repair_legacy(df):
+    """Undo the header shift in the legacy data/matches.csv.
+
+    Older versions rewrote that file with pd.concat, so rows written before the
+    header existed turned into a block of "column names" holding the first row,
+    and everything got shifted by "Unnamed: N" index columns.
+    """
+    df = df.loc[:, ~(df.columns.str.startswith("Unnamed:") & df.isna().all().values)]
+    stray = [c for c in df.columns if c not in COLUMNS]
+    if len(stray) != len(BASIC_COLUMNS):
+        return df
+
+    # pandas de-duplicates repeated names as "Cap", "Cap.1", ...; undo that
+    first_row = [
+        re.sub(r"\.\d+$", "", name) if re.sub(r"\.\d+$", "", name) in stray else name
+        for name in stray
+    ]
+    block = df[stray].set_axis(BASIC_COLUMNS, axis=1).dropna(how="all")
+    rest = df.drop(columns=stray).dropna(how="all")
+    return pd.concat(
+        [pd.DataFrame([first_row], columns=BASIC_COLUMNS), block, rest],
+        ignore_index=True,
+    )
+
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue().encode()
+
+
+def _write_segments(df, log_dir, day, seqs):
+    """Write df as size-capped segments numbered from the iterable seqs; return their paths.
+
+    The compressed size on disk lags behind what zlib still buffers, so a row
+    is only added while the size so far plus everything written since the last
+    flush (deflate never grows data by more than GZIP_OVERHEAD) still fits the
+    cap; otherwise the stream is flushed to get the exact size and checked again.
+    Each segment is written to a temp file and renamed into place, replacing any
+    segment already holding that number.
+    """
+    seqs = iter(seqs)
+    paths = []
+    rows = df.astype(object).where(df.notna(), "").itertuples(index=False)
+    row = next(rows, None)
+    while row is not None:
+        path = _segment_path(log_dir, day, next(seqs))
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            header = _csv_line(df.columns)
+            f.write(header)
+            pending = len(header)
+            written = 0
+            while row is not None:
+                line = _csv_line(row)
+                if written and raw.tell() + pending + len(line) + GZIP_OVERHEAD > MAX_SEGMENT_BYTES:
+                    f.flush()
+                    pending = 0
+                    if raw.tell() + len(line) + GZIP_OVERHEAD > MAX_SEGMENT_BYTES:
+                        break
+                f.write(line)
+                pending += len(line)
+                written += 1
+                row = next(rows, None)
+        paths.append((tmp, path))
+    for tmp, path in paths:
+        tmp.replace(path)
+    return [path for _, path in paths]
+
+
+def _free_seqs(used):
+    """Yield sequence numbers from 000 upwards, skipping those in used."""
+    seq = 0
+    while True:
+        if seq not in used:
+            yield seq
+        seq += 1
+
+
+def migrate_legacy(log_dir=None, legacy_csv=None):
+    """Split the legacy single-file log into day partitions.
+
+    The legacy file is kept, renamed to matches.csv.migrated, so a bad header
+    repair can be undone by hand. Returns the renamed path, or None when there
+    was nothing to migrate.
+    """
+    log_dir = Path(log_dir or LOG_DIR)
+    legacy_csv = Path(legacy_csv or LEGACY_CSV)
+    if not legacy_csv.exists():
+        return None
+
+    with _compact_lock, _append_lock:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        days = _segments(log_dir)
+        legacy = _normalize(_repair_legacy(pd.read_csv(legacy_csv)))
+        match_days = pd.to_datetime(legacy["match_date"], errors="coerce").dt.strftime("%Y-%m-%d")
+        for day, rows in legacy.groupby(match_days.fillna(date.today().isoformat())):
+            used = {_seq(p) for p in days.get(day, [])}
+            _write_segments(rows, log_dir, day, _free_seqs(used))
+
+        migrated = legacy_csv.with_name(legacy_csv.name + ".migrated")
+        n = 0
+        while migrated.exists():
+            n += 1
+            migrated = legacy_csv.with_name(f"{legacy_csv.name}.migrated-{n}")
+        legacy_csv.rename(migrated)
+    return migrated
+
+
+def compact(log_dir=None):
+    """Merge each closed day's small segments, drop exact duplicates and normalize columns.
+
+    Segments that reached the size cap are left as they are, so each run only
+    touches the small tail of each day and a compacted day is not rewritten
+    again. Today's partition is left alone since it is still being appended to,
+    and each day is rewritten under the append lock, so an append that started
+    just before midnight cannot land in a segment being merged.
+    Merged segments reuse the lowest free sequence numbers (overwriting inputs)
+    before leftover inputs are deleted, so an interrupted run only leaves
+    duplicates for the next run to drop.
+    """
+    log_dir = Path(log_dir or LOG_DIR)
+    today = date.today().isoformat()
+
+    with _compact_lock:
+        for day in _segments(log_dir):
+            if day >= today:
+                continue
+            with _append_lock:
+                paths = _segments(log_dir).get(day, [])
+                small = [p for p in paths if p.stat().st_size < MAX_SEGMENT_BYTES]
+                if len(small) < 2:
+                    continue
+                merged = pd.concat([_normalize(pd.read_csv(p)) for p in small], ignore_index=True)
+                merged = merged.reindex(columns=_fieldnames(merged.columns)).drop_duplicates()
+                full = {_seq(p) for p in paths} - {_seq(p) for p in small}
+                written = _write_segments(merged, log_dir, day, _free_seqs(full))
+                for path in set(small) - set(written):
+                    path.unlink()
+
+
+def _open_day(log_dir, day):
+    """Open all of a day's segments at once, so the reader sees one consistent set.
+
+    Taken under the compaction lock (but not held while reading): compaction
+    either finished rewriting the day or has not started, and the open files
+    stay readable even if it replaces or deletes them afterwards.
+    """
+    files = []
+    with _compact_lock:
+        for path in _segments(log_dir).get(day, []):
+            try:
+                files.append(gzip.open(path, "rt", newline=""))
+            except FileNotFoundError:
+                continue
+    return files
+
+
+def iter_matches(start=None, end=None, log_dir=None, chunksize=10_000):
+    """Lazily yield normalized DataFrame chunks of the match log, oldest first.
+
+    start/end (dates, inclusive) skip whole partitions without opening them.
+    No lock is held while a chunk is being consumed, so a paused or abandoned
+    reader never blocks compaction.
+    """
+    log_dir = log_dir or LOG_DIR
+    for day in _segments(log_dir):
+        if (start and day < start.isoformat()) or (end and day > end.isoformat()):
+            continue
+        files = _open_day(log_dir, day)
+        try:
+            for f in files:
+                for chunk in pd.read_csv(f, chunksize=chunksize):
+                    yield _normalize(chunk)
+        finally:
+            for f in files:
+                f.close()
+
+
+if __name__ == "__main__":
+    migrated = migrate_legacy()
+    if migrated:
+        print(f"✅ Split {LEGACY_CSV} into day partitions (original kept as {migrated})")
+    compact()
+    print(f"✅ Compacted match log in {LOG_DIR}")
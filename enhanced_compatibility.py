@@ -6,6 +6,7 @@ from datetime import datetime
 from csv_handler import append_to_csv
 from s3_upload import upload_to_s3
 from config import S3_BUCKET
+from profiling import run_cli
 
 def get_person_details(label):
     print(f"\nEnter details for {label}:")
@@ -290,7 +291,7 @@ def main():
         
         # Upload to S3
         try:
-            s3_key = f"astrology-matches/enhanced_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            s3_key = f"astrology-matches/{csv_file.name}"
             upload_to_s3(str(csv_file), s3_key)
             print(f"☁️  Enhanced CSV uploaded to S3: s3://{S3_BUCKET}/{s3_key}")
         except Exception as e:
@@ -300,4 +301,4 @@ def main():
         print(f"\n❌ No match saved (score {score:.2f}% below 50% threshold)")
 
 if __name__ == "__main__":
-    main()
+    run_cli(main, "enhanced_compatibility")
@@ -0,0 +1,317 @@
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from math import atan2, cos, degrees, radians, sin, tan
+from pathlib import Path
+from types import SimpleNamespace
+
+import kerykeion
+import pytz
+import swisseph as swe
+
+# Use the ephemeris files bundled with kerykeion so positions match its charts
+swe.set_ephe_path(str(Path(kerykeion.__file__).parent / "sweph"))
+
+# Sign abbreviations in zodiac order, as used by kerykeion (e.g. person.sun.sign)
+SIGNS = ["Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis"]
+
+PLANETS = {
+    "sun": swe.SUN,
+    "moon": swe.MOON,
+    "venus": swe.VENUS,
+    "mars": swe.MARS,
+    "jupiter": swe.JUPITER,
+    "saturn": swe.SATURN,
+}
+
+MINUTE = 1 / 1440  # one minute as a fraction of a Julian day
+
+
+@lru_cache(maxsize=None)
+def _timezone(tz_str):
+    return pytz.timezone(tz_str)
+
+
+def _utc_offset(dt: datetime, tz_str: str) -> timedelta:
+    """UTC offset of a naive local datetime, as pytz's localize(dt) would give it.
+
+    Looks the offset up directly in the zone's transition table; only the rare
+    times that fall in a DST gap or overlap go through localize itself.
+    """
+    zone = _timezone(tz_str)
+    transitions = getattr(zone, "_utc_transition_times", None)
+    if not transitions:
+        return zone.utcoffset(dt)  # fixed-offset zone such as UTC
+    infos = zone._transition_info
+    # dt is local time, so the transition in effect is at most a couple of entries away
+    i = bisect_right(transitions, dt) - 1
+    offsets = []
+    for j in range(max(i - 2, 0), min(i + 3, len(transitions))):
+        offset = infos[j][0]
+        if transitions[j] <= dt - offset and (j + 1 == len(transitions) or dt - offset < transitions[j + 1]):
+            offsets.append(offset)
+    if len(offsets) == 1:
+        return offsets[0]
+    return zone.localize(dt).utcoffset()
+
+
+def local_to_julian(dt: datetime, tz_str: str) -> float:
+    """Convert a naive local datetime in tz_str to a UT Julian day.
+
+    Uses pytz's zone data like kerykeion does, so both agree on historical and
+    post-2037 offsets.
+    """
+    utc = dt - _utc_offset(dt, tz_str)
+    hour = utc.hour + utc.minute / 60 + utc.second / 3600
+    return swe.julday(utc.year, utc.month, utc.day, hour)
+
+
+def julian_to_local(jd: float, tz_str: str) -> datetime:
+    """Convert a UT Julian day to a naive local datetime in tz_str (rounded to the minute)."""
+    year, month, day, hour = swe.revjul(jd)
+    minutes = round(hour * 60)
+    utc = datetime(year, month, day, tzinfo=timezone.utc) + timedelta(minutes=minutes)
+    return utc.astimezone(_timezone(tz_str)).replace(tzinfo=None)
+
+
+def sign_of(longitude: float) -> str:
+    """Return the sign abbreviation for an ecliptic longitude in degrees."""
+    return SIGNS[int(longitude // 30) % 12]
+
+
+def planet_sign(jd: float, planet: str) -> str:
+    """Tropical geocentric sign of a planet (key of PLANETS) at a UT Julian day."""
+    longitude = swe.calc_ut(jd, PLANETS[planet], swe.FLG_SWIEPH)[0][0]
+    return sign_of(longitude)
+
+
+def ascendant_sign(jd: float, lat: float, lng: float) -> str:
+    """Tropical Ascendant sign at a UT Julian day for the given location."""
+    _, ascmc = swe.houses(jd, lat, lng, b"P")
+    return sign_of(ascmc[0])
+
+
+def find_change(func, jd_start: float, jd_end: float, precision: float = MINUTE) -> float:
+    """Bisect for the instant in (jd_start, jd_end] where func(jd) stops equalling func(jd_start)."""
+    start_value = func(jd_start)
+    while jd_end - jd_start > precision:
+        mid = (jd_start + jd_end) / 2
+        if func(mid) == start_value:
+            jd_start = mid
+        else:
+            jd_end = mid
+    return jd_end
+
+
+def segments(func, jd_start: float, jd_end: float, step: float):
+    """Split [jd_start, jd_end) into (start, end, value) runs where func is constant.
+
+    func is sampled every `step` days and changes are located by bisection, so
+    step must be shorter than the briefest run we care about.
+    """
+    seg_start = jd_start
+    value = func(jd_start)
+    t = jd_start
+    while t < jd_end:
+        t_next = min(t + step, jd_end)
+        while func(t_next) != value:
+            change = find_change(func, t, t_next)
+            yield seg_start, change, value
+            seg_start, t, value = change, change, func(change)
+        t = t_next
+    yield seg_start, jd_end, value
+
+
+# --- Fast path: sign placements without building a full AstrologicalSubject ---
+
+SECOND = 1 / 86400  # one second as a fraction of a Julian day
+INGRESS_PLANETS = ("sun", "moon")  # always direct, so each sign is entered once per cycle
+# Precomputed timetables (little-endian float64 UT Julian days, from TABLE_START to a
+# closing TABLE_END) cover births 1900-2100 in any timezone
+INGRESS_DIR = Path(__file__).resolve().parent / "cache"
+TABLE_START = swe.julday(1899, 12, 1, 0)
+TABLE_END = swe.julday(2101, 2, 1, 0)
+
+
+def _position(jd, planet):
+    """Return (longitude, daily speed) of a planet at a UT Julian day."""
+    pos = swe.calc_ut(jd, PLANETS[planet], swe.FLG_SWIEPH | swe.FLG_SPEED)[0]
+    return pos[0], pos[3]
+
+
+def build_ingress_table(planet: str, jd_start: float, jd_end: float) -> array:
+    """Instants in (jd_start, jd_end) at which the Sun or Moon enters a new sign.
+
+    Each ingress is found by Newton iteration on the distance to the next cusp,
+    so a year of Moon ingresses costs a few hundred ephemeris calls. The first
+    element is jd_start itself, so the planet's sign at instants[i] is its sign
+    at jd_start advanced by i.
+    """
+    jd = jd_start
+    longitude, speed = _position(jd, planet)
+    sign = int(longitude // 30)
+    instants = array("d", [jd])
+    while True:
+        cusp = (sign + 1) % 12 * 30
+        jd += ((cusp - longitude) % 360) / speed
+        for _ in range(10):
+            longitude, speed = _position(jd, planet)
+            correction = ((longitude - cusp + 180) % 360 - 180) / speed
+            jd -= correction
+            if abs(correction) < SECOND:
+                break
+        # Step just past the cusp so the instant itself already has the new sign
+        jd += SECOND
+        if jd >= jd_end:
+            return instants
+        instants.append(jd)
+        sign = (sign + 1) % 12
+
+
+def build_ingress_tables():
+    """Precompute the Sun and Moon timetables for TABLE_START-TABLE_END into INGRESS_DIR."""
+    INGRESS_DIR.mkdir(parents=True, exist_ok=True)
+    for planet in INGRESS_PLANETS:
+        instants = build_ingress_table(planet, TABLE_START, TABLE_END)
+        instants.append(TABLE_END)
+        if sys.byteorder != "little":
+            instants.byteswap()
+        path = INGRESS_DIR / f"ingresses_{planet}.f64"
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            instants.tofile(f)
+        tmp.replace(path)
+    ingress_table.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def ingress_table(planet: str):
+    """Load the precomputed timetable of the Sun or Moon as (instants, first sign index).
+
+    Returns None when the table has not been built (see build_ingress_tables)
+    or does not start at TABLE_START and end at TABLE_END, e.g. when truncated.
+    """
+    path = INGRESS_DIR / f"ingresses_{planet}.f64"
+    if not path.exists():
+        return None
+    data = path.read_bytes()
+    instants = array("d")
+    if len(data) % instants.itemsize == 0:
+        instants.frombytes(data)
+    if sys.byteorder != "little":
+        instants.byteswap()
+    if len(instants) < 2 or instants[0] != TABLE_START or instants[-1] != TABLE_END:
+        print(f"⚠️ Ignoring invalid ingress table {path}; rebuild it with: python ephemeris.py --build-tables")
+        return None
+    return instants, SIGNS.index(planet_sign(instants[0], planet))
+
+
+def fast_planet_sign(jd: float, planet: str) -> str:
+    """Sign of the Sun or Moon by binary search in its precomputed ingress timetable.
+
+    Outside the table's range, or before it has been built, this is a single
+    ephemeris call instead.
+    """
+    table = ingress_table(planet)
+    if table is None or not TABLE_START <= jd < TABLE_END:
+        return planet_sign(jd, planet)
+    instants, first_sign = table
+    return SIGNS[(first_sign + bisect_right(instants, jd) - 1) % 12]
+
+
+def fast_ascendant_sign(jd: float, lat: float, lng: float) -> str:
+    """Ascendant sign from local sidereal time, without computing house cusps.
+
+    Uses mean sidereal time and mean obliquity, which agree with Swiss
+    Ephemeris to within ~0.02° (a few seconds of clock time).
+    """
+    t = (jd - 2451545.0) / 36525
+    gmst = 280.46061837 + 360.98564736629 * (jd - 2451545.0) + 0.000387933 * t * t - t ** 3 / 38710000
+    ramc = radians((gmst + lng) % 360)
+    obliquity = radians(23.439291 - 0.0130042 * t)
+    ascendant = degrees(atan2(cos(ramc), -(sin(ramc) * cos(obliquity) + tan(radians(lat)) * sin(obliquity))))
+    return sign_of(ascendant % 360)
+
+
+def sign_placements(name, year, month, day, hour, minute, lat, lng, tz_str,
+                    placements=("sun", "moon", "ascendant")):
+    """Build a lightweight chart holding only the requested sign placements.
+
+    The result quacks like AstrologicalSubject for `.name`, `.lat`, `.lng`,
+    `.tz_str` and `.<placement>.sign`, which is all the sign-based scoring reads.
+    Sun and Moon come from the ingress timetables, the Ascendant from sidereal
+    time, and any other planet from a single ephemeris call.
+    """
+    jd = local_to_julian(datetime(year, month, day, hour, minute), tz_str)
+    chart = SimpleNamespace(name=name, lat=lat, lng=lng, tz_str=tz_str)
+    for placement in placements:
+        if placement == "ascendant":
+            sign = fast_ascendant_sign(jd, lat, lng)
+        elif placement in INGRESS_PLANETS:
+            sign = fast_planet_sign(jd, placement)
+        else:
+            sign = planet_sign(jd, placement)
+        setattr(chart, placement, SimpleNamespace(sign=sign))
+    return chart
+
+
+def validate_fast_path(samples=2000, seed=0):
+    """Compare sign_placements against kerykeion on random births and time both."""
+    import random
+    import time
+    import warnings
+
+    from kerykeion import AstrologicalSubject
+
+    rng = random.Random(seed)
+    zones = ["UTC", "Asia/Kolkata", "America/New_York", "Europe/London", "Asia/Tokyo", "Australia/Sydney"]
+    births = []
+    for _ in range(samples):
+        moment = datetime(1900, 1, 1) + timedelta(minutes=rng.randrange(200 * 525960))
+        births.append((moment, rng.uniform(-60, 60), rng.uniform(-180, 180), rng.choice(zones)))
+
+    mismatches = {"sun": 0, "moon": 0, "ascendant": 0}
+    compared = 0
+    full_time = fast_time = 0.0
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for moment, lat, lng, tz_str in births:
+            args = (moment.year, moment.month, moment.day, moment.hour, moment.minute)
+            started = time.perf_counter()
+            try:
+                full = AstrologicalSubject("v", *args, lat=lat, lng=lng, tz_str=tz_str, online=False)
+            except Exception:
+                continue  # ambiguous/nonexistent local times are rejected by kerykeion
+            full_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            fast = sign_placements("v", *args, lat, lng, tz_str)
+            fast_time += time.perf_counter() - started
+
+            compared += 1
+            for placement in mismatches:
+                if getattr(full, placement).sign != getattr(fast, placement).sign:
+                    mismatches[placement] += 1
+
+    print(f"Compared {compared} random births (1900-2100, |lat| <= 60)")
+    for placement, count in mismatches.items():
+        print(f"  {placement:<10} {count} mismatches ({count / compared:.3%})")
+    print(f"kerykeion: {full_time / compared * 1e6:8.1f} µs/chart")
+    print(f"fast path: {fast_time / compared * 1e6:8.1f} µs/chart ({full_time / fast_time:.0f}x faster)")
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or validate the fast sign path")
+    parser.add_argument("--build-tables", action="store_true",
+                        help=f"precompute the Sun/Moon ingress timetables into {INGRESS_DIR}")
+    parser.add_argument("--samples", type=int, default=2000, help="random births to validate against kerykeion")
+    args = parser.parse_args()
+    if args.build_tables:
+        build_ingress_tables()
+        print(f"✅ Ingress timetables written to {INGRESS_DIR}")
+    validate_fast_path(args.samples)
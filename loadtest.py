@@ -0,0 +1,317 @@
+"""Load generator for the create-subject → score → save → upload flow.
+
+GeoNames, Google Geocoding and S3 are replaced by local stub servers with
+configurable latency and error injection, so runs are repeatable and free:
+
+    python loadtest.py --sessions 200 --concurrency 20 --geonames-errors 0.1
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time as dtime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Coordinates served by the GeoNames/Google stubs, picked by hashing the city name
+STUB_CITIES = [
+    ("London", "GB", 51.50853, -0.12574, "Europe/London"),
+    ("New York", "US", 40.71427, -74.00597, "America/New_York"),
+    ("Mumbai", "IN", 19.07283, 72.88261, "Asia/Kolkata"),
+    ("Sao Paulo", "BR", -23.5475, -46.63611, "America/Sao_Paulo"),
+    ("Tokyo", "JP", 35.6895, 139.69171, "Asia/Tokyo"),
+]
+# Coordinates create_astrological_subject falls back to when GeoNames fails
+FALLBACK_COORDINATES = (25.3176, 82.9739)
+STAGES = ["geocode", "create_subject", "score", "save", "upload"]
+# Attempts per S3 request; boto3 would otherwise retry the stub's 503s and hide them
+S3_ATTEMPTS = 1
+
+
+def _stub_city(name):
+    return STUB_CITIES[int(hashlib.md5(name.encode()).hexdigest(), 16) % len(STUB_CITIES)]
+
+
+def _geonames_route(path, query, body):
+    if path.endswith("/searchJSON"):
+        name, country, lat, lng, _ = _stub_city(query["q"][0])
+        payload = {"geonames": [{"name": name, "lat": str(lat), "lng": str(lng), "countryCode": country}]}
+    elif path.endswith("/timezoneJSON"):
+        lat, lng = float(query["lat"][0]), float(query["lng"][0])
+        tz = next(c[4] for c in STUB_CITIES if (c[2], c[3]) == (lat, lng))
+        payload = {"timezoneId": tz}
+    else:
+        return 404, {}, b""
+    return 200, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+
+
+def _google_route(path, query, body):
+    _, _, lat, lng, _ = _stub_city(query["address"][0])
+    payload = {"status": "OK", "results": [{"geometry": {"location": {"lat": lat, "lng": lng}}}]}
+    return 200, {"Content-Type": "application/json"}, json.dumps(payload).encode()
+
+
+def _s3_route(path, query, body):
+    # Enough of PutObject for boto3's upload_file on small files
+    return 200, {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}, b""
+
+
+class StubServer:
+    """Threaded HTTP stub that answers via `route` after an injected delay or error.
+
+    latency/jitter are in seconds; error_rate is the fraction of requests that
+    get a 503 instead of the routed response.
+    """
+
+    def __init__(self, name, route, latency=0.0, jitter=0.0, error_rate=0.0):
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _read_body(self):
+                if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+                    chunks = []
+                    while True:
+                        size = int(self.rfile.readline().split(b";")[0], 16)
+                        if size == 0:
+                            # Skip trailers (boto3 sends checksums here) up to the blank line
+                            while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                                pass
+                            return b"".join(chunks)
+                        chunks.append(self.rfile.read(size))
+                        self.rfile.readline()
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def _handle(self):
+                body = self._read_body()
+                time.sleep(max(0.0, random.gauss(latency, jitter)))
+                with stub._lock:
+                    stub.requests += 1
+                    failed = random.random() < error_rate
+                    stub.errors += failed
+                if failed:
+                    status, headers, payload = 503, {}, b"Service Unavailable"
+                else:
+                    url = urlsplit(self.path)  # absolute when we are acting as a proxy
+                    status, headers, payload = route(url.path, parse_qs(url.query), body)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_PUT = do_POST = do_HEAD = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Metrics:
+    """Thread-safe per-stage latency, error and fallback counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.fallbacks = defaultdict(int)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self.errors[name] += 1
+            raise
+        finally:
+            with self._lock:
+                self.latencies[name].append(time.perf_counter() - started)
+
+    def fallback(self, name):
+        with self._lock:
+            self.fallbacks[name] += 1
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    return values[min(len(values) - 1, max(0, math.ceil(pct / 100 * len(values)) - 1))]
+
+
+def run_session(i, metrics, cities, save_threshold):
+    """One simulated user: geocode, build both charts, score, save, upload."""
+    from botocore.config import Config
+
+    from api_client import get_coordinates
+    from csv_handler import append_to_csv
+    from enhanced_compatibility import advanced_compatibility_score
+    from s3_upload import upload_to_s3
+    from streamlit_app import create_astrological_subject
+
+    rng = random.Random(i)
+    people = []
+    for label in ("A", "B"):
+        place = f"Stubville {rng.randrange(cities)}"
+        dob = date(rng.randint(1950, 2005), rng.randint(1, 12), rng.randint(1, 28))
+        tob = dtime(rng.randrange(24), rng.randrange(60))
+
+        # Google geocoding is optional in the app, so a failure here is not fatal
+        with contextlib.suppress(Exception), metrics.stage("geocode"):
+            get_coordinates(place)
+
+        with metrics.stage("create_subject"):
+            person = create_astrological_subject(f"{label}{i}", dob, tob, place, "loadtest")
+        if (person.lat, person.lng) == FALLBACK_COORDINATES:
+            metrics.fallback("create_subject")
+        people.append(person)
+
+    person1, person2 = people
+    with metrics.stage("score"):
+        percentage, points, total = advanced_compatibility_score(person1, person2)
+    if percentage < save_threshold:
+        return
+
+    with metrics.stage("save"):
+        csv_file = append_to_csv({
+            "person1_name": person1.name,
+            "person1_sun_sign": person1.sun.sign,
+            "person1_moon_sign": person1.moon.sign,
+            "person1_ascendant": person1.ascendant.sign,
+            "person1_venus": person1.venus.sign,
+            "person1_mars": person1.mars.sign,
+            "person2_name": person2.name,
+            "person2_sun_sign": person2.sun.sign,
+            "person2_moon_sign": person2.moon.sign,
+            "person2_ascendant": person2.ascendant.sign,
+            "person2_venus": person2.venus.sign,
+            "person2_mars": person2.mars.sign,
+            "compatibility_score": percentage,
+            "compatibility_points": points,
+            "total_possible_points": total,
+            "match_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+
+    with metrics.stage("upload"):
+        upload_to_s3(str(csv_file), f"astrology-matches/{csv_file.name}",
+                     config=Config(retries={"total_max_attempts": S3_ATTEMPTS}))
+
+
+def report(metrics, sessions, failed_sessions, wall_time, stubs):
+    print(f"\n{'='*78}")
+    print(f"📈 LOAD TEST: {sessions} sessions in {wall_time:.2f}s "
+          f"({sessions / wall_time:.2f} sessions/s, {failed_sessions} failed)")
+    print(f"{'='*78}")
+    print(f"{'stage':<16}{'count':>7}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'errors':>9}{'fallback':>10}")
+    for stage in STAGES:
+        values = sorted(metrics.latencies[stage])
+        if not values:
+            continue
+        count = len(values)
+        p50, p95, p99 = (_percentile(values, p) * 1000 for p in (50, 95, 99))
+        print(f"{stage:<16}{count:>7}{count / wall_time:>9.2f}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}"
+              f"{metrics.errors[stage] / count:>9.1%}{metrics.fallbacks[stage] / count:>10.1%}")
+    print("\nStub servers:")
+    for stub in stubs:
+        print(f"  {stub.name:<10} {stub.requests:>6} requests, {stub.errors} injected errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100, help="total simulated sessions")
+    parser.add_argument("--concurrency", type=int, default=10, help="sessions running at once")
+    parser.add_argument("--cities", type=int, default=1000,
+                        help="distinct birthplaces; fewer means more GeoNames cache hits")
+    parser.add_argument("--save-threshold", type=float, default=0,
+                        help="only save/upload matches scoring at least this (%%)")
+    parser.add_argument("--jitter", type=float, default=0.3, help="latency std-dev as a fraction of the mean")
+    for service, latency in (("geonames", 150), ("google", 100), ("s3", 80)):
+        parser.add_argument(f"--{service}-latency", type=float, default=latency, help="mean latency in ms")
+        parser.add_argument(f"--{service}-errors", type=float, default=0.0, help="error rate (0-1)")
+    args = parser.parse_args()
+
+    def stub(name, route):
+        latency = getattr(args, f"{name}_latency") / 1000
+        return StubServer(name, route, latency, latency * args.jitter, getattr(args, f"{name}_errors"))
+
+    stubs = [stub("geonames", _geonames_route), stub("google", _google_route), stub("s3", _s3_route)]
+    geonames, google, s3 = stubs
+
+    # Point every integration at the stubs before the app modules read their config.
+    # kerykeion hardcodes http://api.geonames.org, so that stub also acts as an HTTP proxy.
+    os.environ.update({
+        "HTTP_PROXY": geonames.url,
+        "NO_PROXY": "127.0.0.1,localhost",
+        "GOOGLE_API_KEY": "loadtest",
+        "GOOGLE_GEOCODE_URL": f"{google.url}/maps/api/geocode/json",
+        "S3_ENDPOINT_URL": s3.url,
+        "S3_BUCKET": "loadtest",
+        "REGION": "us-east-1",
+        "AWS_ACCESS_KEY": "loadtest",
+        "AWS_SECRET_KEY": "loadtest",
+    })
+
+    # Keep the match log and GeoNames cache of the run out of the real data/ and cache/
+    workdir = tempfile.TemporaryDirectory(prefix="astro-loadtest-")
+    project_dir = os.getcwd()
+    os.chdir(workdir.name)
+    metrics = Metrics()
+    failed_sessions = 0
+    print(f"Running {args.sessions} sessions with concurrency {args.concurrency}...")
+    try:
+        started = time.perf_counter()
+        # The app modules print progress and kerykeion logs every failed GeoNames
+        # lookup; silence both for the duration of the run (failures are counted)
+        logging.disable(logging.ERROR)
+        with contextlib.redirect_stdout(io.StringIO()), \
+                ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            futures = [
+                pool.submit(run_session, i, metrics, args.cities, args.save_threshold)
+                for i in range(args.sessions)
+            ]
+            for future in futures:
+                if future.exception() is not None:
+                    failed_sessions += 1
+        wall_time = time.perf_counter() - started
+    finally:
+        # Saves start background compactors that use paths relative to the cwd;
+        # let them finish in the temp dir before switching back to the project
+        for thread in threading.enumerate():
+            if thread.name == "match-log-compactor":
+                thread.join()
+        logging.disable(logging.NOTSET)
+        os.chdir(project_dir)
+        workdir.cleanup()
+        for s in stubs:
+            s.close()
+
+    report(metrics, args.sessions, failed_sessions, wall_time, stubs)
+
+
+if __name__ == "__main__":
+    main()
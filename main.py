@@ -2,10 +2,29 @@ import os
 os.environ["GEONAMES_USERNAME"] = "siddhyadav"
 
 from kerykeion import AstrologicalSubject
+from kerykeion.fetch_geonames import FetchGeonames
 from datetime import datetime
 from csv_handler import append_to_csv
 from s3_upload import upload_to_s3
-from config import S3_BUCKET
+from config import S3_BUCKET, FAST_SIGN_PATH
+from ephemeris import sign_placements
+from profiling import run_cli
+
+# Placements read by compatibility_score
+BASIC_PLACEMENTS = ("sun", "moon", "ascendant")
+
+def get_fast_placements(name, year, month, day, hour, minute, place):
+    """Look up the birthplace and compute only BASIC_PLACEMENTS, without a full chart."""
+    print(f"Fetching coordinates for {place}...")
+    city_data = FetchGeonames(place, "GB", username="siddhyadav").get_serialized_data()
+    if {"lat", "lng", "timezonestr"} <= city_data.keys():
+        lat, lng, tz_str = float(city_data["lat"]), float(city_data["lng"]), city_data["timezonestr"]
+    else:
+        print(f"Could not find coordinates for '{place}'. Using default coordinates.")
+        print("Please try a more specific city name (e.g., 'Varanasi, India' instead of 'Varanasi')")
+        lat, lng, tz_str = 25.3176, 82.9739, "Asia/Kolkata"  # Varanasi coordinates
+
+    return sign_placements(name, year, month, day, hour, minute, lat, lng, tz_str, BASIC_PLACEMENTS)
 
 def get_person_details(label):
     print(f"\nEnter details for {label}:")
@@ -64,6 +83,10 @@ def get_person_details(label):
     
     place = input("Place of Birth (City name): ")
 
+    # The basic score only needs Sun/Moon/Ascendant signs, so skip the full chart
+    if FAST_SIGN_PATH:
+        return get_fast_placements(name, year, month, day, hour, minute, place)
+
     # Try to create AstrologicalSubject with geonames, fallback to manual coordinates
     try:
         print(f"Fetching coordinates for {place}...")
@@ -153,7 +176,7 @@ def main():
         
         # Upload to S3
         try:
-            s3_key = f"astrology-matches/matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            s3_key = f"astrology-matches/{csv_file.name}"
             upload_to_s3(str(csv_file), s3_key)
             print(f"☁️  CSV uploaded to S3: s3://{S3_BUCKET}/{s3_key}")
         except Exception as e:
@@ -163,4 +186,4 @@ def main():
         print(f"\n❌ No match saved (score {score:.2f}% below 50% threshold)")
 
 if __name__ == "__main__":
-    main()
+    run_cli(main, "main")
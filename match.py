@@ -1,6 +1,7 @@
 from match import match_people
 from csv_handler import append_to_csv
 from s3_upload import upload_to_s3
+from profiling import run_cli
 
 def main():
     person1 = {
@@ -23,7 +24,7 @@ def main():
     csv_file_path = append_to_csv(match_result)
 
     # Upload to S3
-    upload_to_s3(str(csv_file_path), "matches.csv")
+    upload_to_s3(str(csv_file_path), f"astrology-matches/{csv_file_path.name}")
 
 if __name__ == "__main__":
-    main()
+    run_cli(main, "match")
@@ -0,0 +1,209 @@
+import argparse
+import builtins
+import contextlib
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+PROFILE_DIR = Path("profiles")
+PROJECT_DIR = Path(__file__).resolve().parent
+
+# Attribution buckets, matched against a function's file path or built-in name
+CATEGORIES = {
+    "kerykeion": ["kerykeion", "swisseph"],
+    "pandas": ["pandas", "numpy"],
+    "boto3": ["boto3", "botocore", "s3transfer"],
+}
+WAITING = "input (waiting)"
+
+
+@lru_cache(maxsize=None)
+def _file_category(filename):
+    """Return the bucket a source file belongs to, or None for third-party/stdlib code."""
+    for category, packages in CATEGORIES.items():
+        if any(f"/{package}/" in filename for package in packages):
+            return category
+    if filename.startswith(str(PROJECT_DIR)) and "site-packages" not in filename:
+        return "our code"
+    return None
+
+
+def _categorize(filename, funcname):
+    """Return the bucket for a pstats (filename, funcname) pair, i.e. where the function lives."""
+    if funcname == "<built-in method builtins.input>":
+        return WAITING
+    for category, packages in CATEGORIES.items():
+        if any(f" {package}." in funcname or f"'{package}." in funcname for package in packages):
+            return category
+    return _file_category(filename) or "other"
+
+
+@lru_cache(maxsize=None)
+def _short_path(filename):
+    """Shorten a source path to something readable in a flamegraph frame."""
+    if "site-packages/" in filename:
+        return filename.split("site-packages/", 1)[1]
+    with contextlib.suppress(ValueError):
+        return str(Path(filename).resolve().relative_to(PROJECT_DIR))
+    return Path(filename).name
+
+
+def _profiled_input(prompt=""):
+    # Stands in for input() while profiling so samples taken at a prompt can be told apart
+    return _builtin_input(prompt)
+
+
+_builtin_input = builtins.input
+# cProfile (and the input() swap) are process-wide, so only one run is profiled at a time
+_profile_lock = threading.Lock()
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval and count collapsed stacks.
+
+    Each sample is also attributed to the innermost frame that belongs to a
+    known category, so e.g. pydantic or stdlib time spent inside kerykeion
+    counts as kerykeion.
+    """
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.categories = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            category = WAITING if frame.f_code is _profiled_input.__code__ else None
+            frames = []
+            while frame is not None:
+                filename = frame.f_code.co_filename
+                frames.append(f"{_short_path(filename)}:{frame.f_code.co_name}")
+                category = category or _file_category(filename)
+                frame = frame.f_back
+            self.stacks[";".join(reversed(frames))] += 1
+            self.categories[category or "other"] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        """Write stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def summarize(stats, categories, wall_time, top=15):
+    """Return a text report of sampled time per category and the top-N functions by own time.
+
+    categories is a StackSampler's per-category sample count; the top-N list
+    comes from the deterministic stats and labels each function by where it lives.
+    """
+    rows = []
+    for (filename, lineno, funcname), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        category = _categorize(filename, funcname)
+        if category != WAITING:
+            rows.append((tottime, cumtime, ncalls, category, f"{_short_path(filename)}:{lineno}({funcname})"))
+
+    samples = sum(categories.values()) or 1
+    lines = [f"Total profiled time: {stats.total_tt:.3f}s", "",
+             f"Time by source ({samples} samples, innermost known caller):"]
+    for category, count in categories.most_common():
+        lines.append(f"  {category:<16} {count / samples * wall_time:8.3f}s  {count / samples * 100:5.1f}%")
+
+    lines += ["", f"Top {top} functions by own time:",
+              f"  {'own(s)':>8} {'cum(s)':>8} {'calls':>8}  {'source':<16} function"]
+    for tottime, cumtime, ncalls, category, label in sorted(rows, reverse=True)[:top]:
+        lines.append(f"  {tottime:8.3f} {cumtime:8.3f} {ncalls:8d}  {category:<16} {label}")
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profile_run(name, output_dir=PROFILE_DIR, top=15):
+    """Profile the enclosed block with cProfile and a stack sampler.
+
+    Yields a dict that is filled on exit with the paths of the written
+    `.pstats` and `.collapsed` files and a text `summary`. If another thread
+    (or another tool, e.g. a debugger on Python 3.12+) is already profiling,
+    yields None and runs the block unprofiled. On Python 3.12+ the pstats also
+    include other threads running at the same time; the per-source times
+    come from the sampler and only cover the calling thread.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        yield None
+        return
+    try:
+        report = {}
+        sampler = StackSampler(threading.get_ident())
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # "Another profiling tool is already active"
+            profiler = None
+        if profiler is None:
+            yield None
+            return
+        builtins.input = _profiled_input
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            sampler.stop()
+            builtins.input = _builtin_input
+            report["wall_time"] = time.perf_counter() - started
+
+            output_dir = Path(output_dir)
+            output_dir.mkdir(exist_ok=True)
+            stem = output_dir / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            report["pstats"] = stem.with_suffix(".pstats")
+            report["collapsed"] = stem.with_suffix(".collapsed")
+            profiler.dump_stats(report["pstats"])
+            sampler.write_collapsed(report["collapsed"])
+            report["summary"] = summarize(
+                pstats.Stats(profiler, stream=io.StringIO()), sampler.categories, report["wall_time"], top
+            )
+    finally:
+        _profile_lock.release()
+
+
+def run_cli(main, name):
+    """Run a CLI entry point, profiling it when `--profile` is passed."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", action="store_true",
+                        help="profile the run and write pstats + collapsed stacks to profiles/")
+    parser.add_argument("--profile-top", type=int, default=15, help="number of hot functions to show")
+    args = parser.parse_args()
+
+    if not args.profile:
+        return main()
+
+    with profile_run(name, top=args.profile_top) as report:
+        main()
+    if report is None:
+        print("⚠️ Another profiler is already active; ran without profiling")
+        return
+    print(f"\n{'='*50}")
+    print(f"⏱️  PROFILE ({report['wall_time']:.2f}s wall)")
+    print(f"{'='*50}")
+    print(report["summary"])
+    print(f"\n📁 pstats: {report['pstats']}")
+    print(f"🔥 Flamegraph stacks: {report['collapsed']}")
@@ -0,0 +1,164 @@
+import contextlib
+import io
+from datetime import datetime
+from math import asin, atan2, cos, degrees, radians, sin, tan
+from types import SimpleNamespace
+
+from enhanced_compatibility import advanced_compatibility_score, get_person_details
+from ephemeris import (
+    MINUTE,
+    PLANETS,
+    SIGNS,
+    ascendant_sign,
+    julian_to_local,
+    local_to_julian,
+    planet_sign,
+    segments,
+)
+from profiling import run_cli
+
+# Sample spacing used to spot planet sign changes; the Moon spends ~2.5 days in
+# a sign, so this never skips a whole sign. The Ascendant step depends on latitude.
+PLANET_STEP = 0.25  # days
+OBLIQUITY = radians(23.4393)
+
+
+def _ascendant_step(lat):
+    """Sample spacing (days) of half the briefest Ascendant sign at this latitude.
+
+    Each sign rises over the difference in oblique ascension of its two cusps;
+    sampling at half the shortest such span means no Ascendant sign (and so no
+    matching window) can fall between two samples. Beyond the polar circles
+    signs can rise almost instantly, so fall back to one-minute sampling.
+    """
+    if abs(lat) >= 90 - degrees(OBLIQUITY):
+        return MINUTE
+
+    def oblique_ascension(longitude):
+        lon = radians(longitude)
+        right_ascension = atan2(sin(lon) * cos(OBLIQUITY), cos(lon))
+        declination = asin(sin(OBLIQUITY) * sin(lon))
+        return degrees(right_ascension - asin(tan(radians(lat)) * tan(declination)))
+
+    shortest = min((oblique_ascension(30 * (i + 1)) - oblique_ascension(30 * i)) % 360 for i in range(12))
+    # The sky turns 360.9856° of sidereal time per day
+    return max(MINUTE, shortest / 360.9856 / 2)
+
+
+def _sign_chart(planet_signs, asc_sign):
+    """Build a minimal stand-in for AstrologicalSubject holding only sign placements."""
+    chart = SimpleNamespace(name="Candidate", ascendant=SimpleNamespace(sign=asc_sign))
+    for planet, sign in zip(PLANETS, planet_signs):
+        setattr(chart, planet, SimpleNamespace(sign=sign))
+    return chart
+
+
+def _planet_signs(jd):
+    return tuple(planet_sign(jd, planet) for planet in PLANETS)
+
+
+def find_compatible_windows(
+    person,
+    start: datetime,
+    end: datetime,
+    threshold: float = 50,
+    lat: float | None = None,
+    lng: float | None = None,
+    tz_str: str | None = None,
+):
+    """Find birth windows in [start, end) whose advanced score with person is >= threshold.
+
+    The range is split at Sun/Moon/Venus/Mars/Jupiter/Saturn sign ingresses, and
+    advanced_compatibility_score is evaluated once per distinct sign configuration.
+    The Ascendant only matters through whether it matches person's, so it is
+    resolved (for the candidate's lat/lng, defaulting to person's birthplace) only
+    where that match decides the outcome.
+
+    Returns a list of (window_start, window_end, best_score) with local naive
+    datetimes in tz_str; adjacent qualifying windows are merged.
+    """
+    lat = person.lat if lat is None else lat
+    lng = person.lng if lng is None else lng
+    tz_str = tz_str or person.tz_str
+    target_asc = person.ascendant.sign
+    other_asc = SIGNS[(SIGNS.index(target_asc) + 1) % 12]
+
+    scores = {}
+
+    def score_for(planet_signs, asc_sign):
+        key = (planet_signs, asc_sign)
+        if key not in scores:
+            with contextlib.redirect_stdout(io.StringIO()):
+                scores[key] = advanced_compatibility_score(person, _sign_chart(planet_signs, asc_sign))[0]
+        return scores[key]
+
+    def asc_matches(jd):
+        return ascendant_sign(jd, lat, lng) == target_asc
+
+    ascendant_step = _ascendant_step(lat)
+
+    windows = []
+    jd_start = local_to_julian(start, tz_str)
+    jd_end = local_to_julian(end, tz_str)
+    for seg_start, seg_end, planet_signs in segments(_planet_signs, jd_start, jd_end, PLANET_STEP):
+        with_match = score_for(planet_signs, target_asc)
+        without_match = score_for(planet_signs, other_asc)
+        if without_match >= threshold:
+            windows.append((seg_start, seg_end, with_match))
+        elif with_match >= threshold:
+            for a, b, matched in segments(asc_matches, seg_start, seg_end, ascendant_step):
+                if matched:
+                    windows.append((a, b, with_match))
+
+    merged = []
+    for a, b, score in windows:
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], b, max(merged[-1][2], score))
+        else:
+            merged.append((a, b, score))
+    return [(julian_to_local(a, tz_str), julian_to_local(b, tz_str), score) for a, b, score in merged]
+
+
+def main():
+    print("=== 🔭 Reverse Compatibility Search ===")
+    print("Find birth windows that would be a great match for a given chart")
+
+    person = get_person_details("Person")
+
+    while True:
+        try:
+            start_year = int(input("Search from year (YYYY): "))
+            end_year = int(input("Search to year (YYYY, inclusive): "))
+            if 1900 <= start_year <= end_year <= 2100:
+                break
+            else:
+                print("Please enter a valid year range (1900-2100)")
+        except ValueError:
+            print("Please enter a valid number")
+
+    while True:
+        try:
+            threshold = float(input("Minimum compatibility (%): "))
+            if 0 <= threshold <= 100:
+                break
+            else:
+                print("Please enter a valid percentage (0-100)")
+        except ValueError:
+            print("Please enter a valid number")
+
+    print(f"\nSearching {start_year}-{end_year} (birthplace: {person.lat:.2f}, {person.lng:.2f})...")
+    windows = find_compatible_windows(
+        person, datetime(start_year, 1, 1), datetime(end_year + 1, 1, 1), threshold
+    )
+
+    if not windows:
+        print(f"\n❌ No birth windows reach {threshold:.2f}%")
+        return
+
+    print(f"\n✅ {len(windows)} birth windows reach {threshold:.2f}%:")
+    for window_start, window_end, score in windows:
+        print(f"{window_start:%Y-%m-%d %H:%M} → {window_end:%Y-%m-%d %H:%M}  (up to {score:.2f}%)")
+
+
+if __name__ == "__main__":
+    run_cli(main, "reverse_search")
@@ -1,13 +1,18 @@
 import boto3
-from config import AWS_ACCESS_KEY, AWS_SECRET_KEY, S3_BUCKET, REGION
+from config import AWS_ACCESS_KEY, AWS_SECRET_KEY, S3_BUCKET, REGION, S3_ENDPOINT_URL
 
-def upload_to_s3(file_path, s3_key):
-    """Upload file to AWS S3 bucket."""
+def upload_to_s3(file_path, s3_key, config=None):
+    """Upload file to AWS S3 bucket.
+
+    config is an optional botocore Config, e.g. to change retry behaviour.
+    """
     s3 = boto3.client(
         "s3",
         aws_access_key_id=AWS_ACCESS_KEY,
         aws_secret_access_key=AWS_SECRET_KEY,
-        region_name=REGION
+        region_name=REGION,
+        endpoint_url=S3_ENDPOINT_URL,
+        config=config,
     )
     s3.upload_file(file_path, S3_BUCKET, s3_key)
     print(f"✅ Uploaded {file_path} to s3://{S3_BUCKET}/{s3_key}")
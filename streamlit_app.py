@@ -13,6 +13,7 @@ from enhanced_compatibility import (
 from csv_handler import append_to_csv
 from s3_upload import upload_to_s3
 from config import S3_BUCKET
+from profiling import profile_run
 
 
 def create_astrological_subject(
@@ -63,6 +64,94 @@ def render_chart_details(person: AstrologicalSubject, label: str) -> None:
     st.code(buffer.getvalue())
 
 
+def render_profile_report(report: dict) -> None:
+    """Render a profile_run report with downloads for the pstats and collapsed stacks."""
+    st.subheader("Profile")
+    st.caption(f"Wall time: {report['wall_time']:.2f}s")
+    st.code(report["summary"])
+    c1, c2 = st.columns(2)
+    with c1:
+        st.download_button("Download pstats", report["pstats"].read_bytes(), file_name=report["pstats"].name)
+    with c2:
+        st.download_button("Download flamegraph stacks", report["collapsed"].read_bytes(), file_name=report["collapsed"].name)
+
+
+def run_compatibility(
+    p1: tuple,
+    p2: tuple,
+    geonames_username: str,
+    save_threshold: float,
+    upload_to_s3_opt: bool,
+) -> None:
+    """Build both charts, render the analysis and save/upload the match.
+
+    p1/p2 are (name, date of birth, time of birth, place) as entered in the form.
+    """
+    p1_name, p1_dob, p1_tob, p1_place = p1
+    p2_name, p2_dob, p2_tob, p2_place = p2
+
+    # Build subjects
+    person1 = create_astrological_subject(p1_name, p1_dob, p1_tob, p1_place, geonames_username)
+    person2 = create_astrological_subject(p2_name, p2_dob, p2_tob, p2_place, geonames_username)
+
+    # Show chart summaries
+    st.subheader("Charts")
+    c1, c2 = st.columns(2)
+    with c1:
+        render_chart_details(person1, "Person 1")
+    with c2:
+        render_chart_details(person2, "Person 2")
+
+    # Capture and compute advanced compatibility
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        percentage, points_scored, total_points = advanced_compatibility_score(person1, person2)
+    details_text = buffer.getvalue()
+
+    st.subheader("Compatibility analysis")
+    st.metric("Final Score", f"{percentage:.2f}%")
+    st.caption(f"Points: {points_scored}/{total_points}")
+    if details_text:
+        with st.expander("Show detailed factors"):
+            st.code(details_text)
+
+    # Save if meets threshold
+    if percentage >= save_threshold:
+        match_data = {
+            "person1_name": person1.name,
+            "person1_sun_sign": person1.sun.sign,
+            "person1_moon_sign": person1.moon.sign,
+            "person1_ascendant": person1.ascendant.sign,
+            "person1_venus": person1.venus.sign,
+            "person1_mars": person1.mars.sign,
+            "person2_name": person2.name,
+            "person2_sun_sign": person2.sun.sign,
+            "person2_moon_sign": person2.moon.sign,
+            "person2_ascendant": person2.ascendant.sign,
+            "person2_venus": person2.venus.sign,
+            "person2_mars": person2.mars.sign,
+            "compatibility_score": percentage,
+            "compatibility_points": points_scored,
+            "total_possible_points": total_points,
+            "match_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+        csv_file = append_to_csv(match_data)
+        st.success(f"Match saved to {csv_file}")
+
+        if upload_to_s3_opt:
+            try:
+                s3_key = f"astrology-matches/{csv_file.name}"
+                upload_to_s3(str(csv_file), s3_key)
+                st.info(f"Uploaded to s3://{S3_BUCKET}/{s3_key}")
+            except Exception as e:
+                st.warning(f"S3 upload failed: {e}")
+    else:
+        st.warning(
+            f"Score {percentage:.2f}% is below threshold {save_threshold}%. Not saved."
+        )
+
+
 def main() -> None:
     st.set_page_config(page_title="Astrology Compatibility Tool", page_icon="💞", layout="wide")
     st.title("💞 Astrology Compatibility Tool")
@@ -82,6 +171,11 @@ def main() -> None:
         st.header("Settings")
         save_threshold = st.slider("Save match threshold (%)", min_value=0, max_value=100, value=50, step=5)
         upload_to_s3_opt = st.checkbox("Upload CSV to S3 after save", value=False)
+        # Hidden diagnostics: only shown when the page is opened with ?diagnostics=1
+        profile_opt = False
+        if st.query_params.get("diagnostics") == "1":
+            st.header("Diagnostics")
+            profile_opt = st.checkbox("Profile this run", value=False)
 
     # Input forms
     col1, col2 = st.columns(2)
@@ -128,67 +222,23 @@ def main() -> None:
             st.error("Please fill the following fields: " + ", ".join(missing))
             st.stop()
 
-        # Build subjects
-        person1 = create_astrological_subject(p1_name, p1_dob, p1_tob, p1_place, geonames_username)
-        person2 = create_astrological_subject(p2_name, p2_dob, p2_tob, p2_place, geonames_username)
-
-        # Show chart summaries
-        st.subheader("Charts")
-        c1, c2 = st.columns(2)
-        with c1:
-            render_chart_details(person1, "Person 1")
-        with c2:
-            render_chart_details(person2, "Person 2")
-
-        # Capture and compute advanced compatibility
-        buffer = io.StringIO()
-        with contextlib.redirect_stdout(buffer):
-            percentage, points_scored, total_points = advanced_compatibility_score(person1, person2)
-        details_text = buffer.getvalue()
-
-        st.subheader("Compatibility analysis")
-        st.metric("Final Score", f"{percentage:.2f}%")
-        st.caption(f"Points: {points_scored}/{total_points}")
-        if details_text:
-            with st.expander("Show detailed factors"):
-                st.code(details_text)
-
-        # Save if meets threshold
-        if percentage >= save_threshold:
-            match_data = {
-                "person1_name": person1.name,
-                "person1_sun_sign": person1.sun.sign,
-                "person1_moon_sign": person1.moon.sign,
-                "person1_ascendant": person1.ascendant.sign,
-                "person1_venus": person1.venus.sign,
-                "person1_mars": person1.mars.sign,
-                "person2_name": person2.name,
-                "person2_sun_sign": person2.sun.sign,
-                "person2_moon_sign": person2.moon.sign,
-                "person2_ascendant": person2.ascendant.sign,
-                "person2_venus": person2.venus.sign,
-                "person2_mars": person2.mars.sign,
-                "compatibility_score": percentage,
-                "compatibility_points": points_scored,
-                "total_possible_points": total_points,
-                "match_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            }
-
-            csv_file = append_to_csv(match_data)
-            st.success(f"Match saved to {csv_file}")
-
-            if upload_to_s3_opt:
-                try:
-                    s3_key = f"astrology-matches/enhanced_matches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-                    upload_to_s3(str(csv_file), s3_key)
-                    st.info(f"Uploaded to s3://{S3_BUCKET}/{s3_key}")
-                except Exception as e:
-                    st.warning(f"S3 upload failed: {e}")
-        else:
-            st.warning(
-                f"Score {percentage:.2f}% is below threshold {save_threshold}%. Not saved."
-            )
-
+        profiler = profile_run("streamlit_app") if profile_opt else contextlib.nullcontext()
+        report = None
+        try:
+            with profiler as report:
+                run_compatibility(
+                    (p1_name, p1_dob, p1_tob, p1_place),
+                    (p2_name, p2_dob, p2_tob, p2_place),
+                    geonames_username,
+                    save_threshold,
+                    upload_to_s3_opt,
+                )
+        finally:
+            # Also show the profile when the run stopped early or failed
+            if report is not None:
+                render_profile_report(report)
+        if profile_opt and report is None:
+            st.warning("Another session is being profiled right now; this run was not profiled.")
 
 if __name__ == "__main__":
     main()